@@ -53,7 +53,8 @@ def on_connect():
             "stopped": False,
             "paused": False,
             "thread": None,
-            "reset_flag": False  # Add reset flag to signal transcription thread
+            "reset_flag": False,  # Add reset flag to signal transcription thread
+            "generation": 0  # Bumped per session so stale final passes are dropped
         }
 
 
@@ -66,6 +67,7 @@ def on_start_stream(data):
         clients[sid]["stopped"] = False
         clients[sid]["paused"] = False
         clients[sid]["reset_flag"] = False  # Reset the flag
+        clients[sid]["generation"] = clients[sid].get("generation", 0) + 1
 
     if clients[sid].get("thread") is None or not clients[sid]["thread"].is_alive():
         t = threading.Thread(target=transcribe_loop, args=(
@@ -107,6 +109,7 @@ def on_clear_stream():
             clients[sid]["paused"] = False
             # Set a flag to tell transcription thread to reset its state
             clients[sid]["reset_flag"] = True
+            clients[sid]["generation"] = clients[sid].get("generation", 0) + 1
             logging.info(f"Reset flag set for {sid}")
 
 
@@ -138,6 +141,9 @@ def on_disconnect():
     with LOCK:
         if sid in clients:
             clients[sid]["stopped"] = True
+            # No one is left to receive a final transcript
+            clients[sid]["disconnected"] = True
+            clients[sid]["generation"] = clients[sid].get("generation", 0) + 1
 
             def cleanup():
                 time.sleep(1.5)
@@ -0,0 +1,204 @@
+import sys
+import threading
+import types
+import unittest
+from unittest import mock
+
+# Stub faster_whisper so importing transcribe doesn't download/load a real model
+fake_fw = types.ModuleType("faster_whisper")
+fake_fw.WhisperModel = lambda *args, **kwargs: object()
+fake_fw.BatchedInferencePipeline = lambda model: None
+sys.modules["faster_whisper"] = fake_fw
+
+try:
+    import dotenv  # noqa: F401
+except ImportError:
+    fake_dotenv = types.ModuleType("dotenv")
+    fake_dotenv.load_dotenv = lambda *args, **kwargs: None
+    sys.modules["dotenv"] = fake_dotenv
+
+import transcribe
+
+ONE_SECOND = b'\x00' * (transcribe.SAMPLE_RATE * transcribe.SAMPLE_WIDTH_BYTES)
+
+
+class Word:
+    def __init__(self, word, start, end, probability):
+        self.word = word
+        self.start = start
+        self.end = end
+        self.probability = probability
+
+
+class Segment:
+    def __init__(self, text, words):
+        self.text = text
+        self.words = words
+
+
+class FakePipeline:
+    """Mimics BatchedInferencePipeline.transcribe: returns (segments, info)."""
+
+    def __init__(self, segments, on_call=None):
+        self.segments = segments
+        self.on_call = on_call
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        if self.on_call:
+            self.on_call()
+        return iter(self.segments), None
+
+
+class FakeSocketIO:
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, event, data, room=None):
+        self.emitted.append((event, data, room))
+
+
+class FinalPassTest(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = FakePipeline([
+            Segment(" Hello there.", [
+                Word(" Hello", 0.0, 0.4123, 0.98765),
+                Word(" there.", 0.4123, 0.9, 0.9),
+            ]),
+            Segment(" General Kenobi.", None),
+        ])
+        for patch in [
+            mock.patch.object(transcribe, "final_model", object()),
+            mock.patch.object(transcribe, "BatchedInferencePipeline", lambda model: self.pipeline),
+        ]:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.lock = threading.Lock()
+        self.clients = {"sid1": {"generation": 3}}
+        self.socketio = FakeSocketIO()
+
+    def test_short_audio_returns_empty(self):
+        text, words = transcribe.final_transcribe_buffer(b'\x00' * 100)
+        self.assertEqual((text, words), ("", []))
+        self.assertEqual(self.pipeline.calls, [])
+
+    def test_output_shape(self):
+        text, words = transcribe.final_transcribe_buffer(ONE_SECOND)
+        self.assertEqual(text, "Hello there. General Kenobi.")
+        self.assertEqual(words[0], {"word": " Hello", "start": 0.0, "end": 0.41, "probability": 0.988})
+        self.assertEqual(len(words), 2)
+
+        kwargs = self.pipeline.calls[0]
+        self.assertTrue(kwargs["word_timestamps"])
+        self.assertTrue(kwargs["vad_filter"])
+        self.assertEqual(kwargs["batch_size"], transcribe.FINAL_PASS_BATCH_SIZE)
+
+    def test_emits_final_payload(self):
+        transcribe.run_final_pass("sid1", ONE_SECOND, 3, self.clients, self.lock, self.socketio)
+        self.assertEqual(len(self.socketio.emitted), 1)
+        event, data, room = self.socketio.emitted[0]
+        self.assertEqual((event, room), ("transcript", "sid1"))
+        self.assertEqual(data["final"], "Hello there. General Kenobi.")
+        self.assertEqual(len(data["words"]), 2)
+
+    def test_empty_result_still_emits_final(self):
+        self.pipeline.segments = []
+        transcribe.run_final_pass("sid1", ONE_SECOND, 3, self.clients, self.lock, self.socketio)
+        self.assertEqual(self.socketio.emitted, [("transcript", {"final": "", "words": []}, "sid1")])
+
+    def test_stale_before_start_skips_transcription(self):
+        self.clients["sid1"]["generation"] = 4
+        transcribe.run_final_pass("sid1", ONE_SECOND, 3, self.clients, self.lock, self.socketio)
+        self.assertEqual(self.pipeline.calls, [])
+        self.assertEqual(self.socketio.emitted, [])
+
+    def test_new_session_during_transcription_drops_result(self):
+        def start_new_session():
+            self.clients["sid1"]["generation"] += 1
+        self.pipeline.on_call = start_new_session
+
+        transcribe.run_final_pass("sid1", ONE_SECOND, 3, self.clients, self.lock, self.socketio)
+        self.assertEqual(len(self.pipeline.calls), 1)
+        self.assertEqual(self.socketio.emitted, [])
+
+    def test_disconnected_client_skipped(self):
+        self.clients["sid1"]["disconnected"] = True
+        transcribe.run_final_pass("sid1", ONE_SECOND, 3, self.clients, self.lock, self.socketio)
+        self.assertEqual(self.pipeline.calls, [])
+        self.assertEqual(self.socketio.emitted, [])
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append((fn, args))
+
+
+class TranscribeLoopStopTest(unittest.TestCase):
+    """Step 6 of transcribe_loop: handing a stopped session to the final pass."""
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.socketio = FakeSocketIO()
+        self.executor = FakeExecutor()
+        self.session_buffer = bytearray(ONE_SECOND)
+        self.clients = {"sid1": {
+            "raw_buffer": self.session_buffer,
+            "stopped": True,
+            "paused": False,
+            "reset_flag": False,
+            "generation": 2,
+        }}
+        self.analyze = mock.Mock(return_value="hello")
+        for patch in [
+            mock.patch.object(transcribe, "analyze_audio_buffer", self.analyze),
+            mock.patch.object(transcribe, "final_pass_executor", self.executor),
+        ]:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def run_loop(self, enabled):
+        with mock.patch.object(transcribe, "FINAL_PASS_ENABLED", enabled):
+            transcribe.transcribe_loop("sid1", self.clients, self.lock, self.socketio)
+
+    def test_submits_stopped_session(self):
+        self.run_loop(enabled=True)
+
+        self.assertEqual(len(self.executor.submitted), 1)
+        fn, args = self.executor.submitted[0]
+        sid, audio, generation = args[:3]
+        self.assertIs(fn, transcribe.run_final_pass)
+        self.assertEqual((sid, bytes(audio), generation), ("sid1", ONE_SECOND, 2))
+        # The session's buffer is detached from the client state
+        self.assertIsNot(self.clients["sid1"]["raw_buffer"], self.session_buffer)
+        self.assertEqual(len(self.clients["sid1"]["raw_buffer"]), 0)
+
+    def test_new_session_buffer_untouched(self):
+        new_buffer = bytearray(b'\x01' * 100)
+
+        def start_new_session(raw_bytes):
+            # start_stream arrives while the stopped session is still being transcribed
+            with self.lock:
+                self.clients["sid1"].update(raw_buffer=new_buffer, stopped=False, generation=3)
+            return "hello"
+        self.analyze.side_effect = start_new_session
+
+        self.run_loop(enabled=True)
+
+        self.assertEqual(self.executor.submitted, [])
+        self.assertIs(self.clients["sid1"]["raw_buffer"], new_buffer)
+        self.assertEqual(bytes(new_buffer), b'\x01' * 100)
+        self.assertFalse(any("final" in data for _, data, _ in self.socketio.emitted))
+
+    def test_disabled_emits_live_text_as_final(self):
+        self.run_loop(enabled=False)
+
+        self.assertEqual(self.executor.submitted, [])
+        self.assertEqual(self.socketio.emitted[-1], ("transcript", {"final": "hello", "words": []}, "sid1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,16 @@
 # backend\transcribe.py
 import io
+import os
 import logging
 import wave
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
-from faster_whisper import WhisperModel
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+from dotenv import load_dotenv
+
+load_dotenv()
 
 SAMPLE_RATE = 16000
 SAMPLE_WIDTH_BYTES = 2 
@@ -20,6 +25,18 @@ whisper_model = WhisperModel(
     num_workers=1   # Keep workers low for CPU
 )
 
+# Optional high-accuracy final pass run once a stream is stopped
+FINAL_PASS_ENABLED = os.environ.get("FINAL_PASS_ENABLED", "false").lower() in ("1", "true", "yes")
+FINAL_PASS_BATCH_SIZE = int(os.environ.get("FINAL_PASS_BATCH_SIZE", 8))
+FINAL_PASS_MAX_WORKERS = int(os.environ.get("FINAL_PASS_MAX_WORKERS", 1))
+FINAL_PASS_CPU_THREADS = int(os.environ.get("FINAL_PASS_CPU_THREADS", 2))
+
+# Final pass gets its own model and pool, both created on first use
+final_pass_executor = None
+final_model = None
+FINAL_PASS_EXECUTOR_LOCK = threading.Lock()
+FINAL_MODEL_LOCK = threading.Lock()
+
 # Cache WAV header to avoid recreating it every time
 WAV_HEADER_CACHE = None
 WAV_HEADER_LENGTH = 44  # Standard WAV header size
@@ -94,6 +111,109 @@ def analyze_audio_buffer(raw_bytes):
         logging.exception(f"Error in analyze_audio_buffer: {e}")
         return ""
 
+def get_final_pass_executor():
+    """Lazily create the bounded pool that runs final passes."""
+    global final_pass_executor
+
+    with FINAL_PASS_EXECUTOR_LOCK:
+        if final_pass_executor is None:
+            final_pass_executor = ThreadPoolExecutor(
+                max_workers=FINAL_PASS_MAX_WORKERS,
+                thread_name_prefix="final-pass"
+            )
+    return final_pass_executor
+
+def get_final_model():
+    """
+    Lazily load the dedicated Whisper model for the final pass, so a long
+    final pass never queues behind (or in front of) the live model's worker.
+    """
+    global final_model
+
+    with FINAL_MODEL_LOCK:
+        if final_model is None:
+            final_model = WhisperModel(
+                "base",
+                device="cpu",
+                compute_type="int8",
+                cpu_threads=FINAL_PASS_CPU_THREADS,
+                num_workers=FINAL_PASS_MAX_WORKERS
+            )
+    return final_model
+
+def final_transcribe_buffer(raw_bytes):
+    """
+    High-accuracy transcription of a whole session.
+    Audio is split into VAD segments which are decoded in parallel batches.
+    Returns (text, words) where words carry start/end timestamps.
+    """
+    if not raw_bytes or len(raw_bytes) < SAMPLE_RATE * SAMPLE_WIDTH_BYTES * CHANNELS * 0.3:
+        return "", []
+
+    wav_io = io.BytesIO(create_wav_header(len(raw_bytes)) + raw_bytes)
+
+    # BatchedInferencePipeline keeps per-call state, so build one per call;
+    # the constructor only stores the shared model
+    pipeline = BatchedInferencePipeline(model=get_final_model())
+    segments, _ = pipeline.transcribe(
+        wav_io,
+        language="en",
+        batch_size=FINAL_PASS_BATCH_SIZE,
+        beam_size=5,
+        word_timestamps=True,
+        vad_filter=True,
+        vad_parameters=dict(
+            min_silence_duration_ms=500,
+            threshold=0.5,
+            speech_pad_ms=400,
+            min_speech_duration_ms=250
+        )
+    )
+
+    texts = []
+    words = []
+    for seg in segments:
+        texts.append(seg.text.strip())
+        for word in seg.words or []:
+            words.append({
+                "word": word.word,
+                "start": round(word.start, 2),
+                "end": round(word.end, 2),
+                "probability": round(word.probability, 3)
+            })
+
+    return " ".join(t for t in texts if t), words
+
+def is_current_session(sid, generation, clients, LOCK):
+    """True if the client is still connected and hasn't started/cleared a new session."""
+    with LOCK:
+        if sid not in clients or clients[sid].get("disconnected", False):
+            return False
+        return clients[sid].get("generation", 0) == generation
+
+def run_final_pass(sid, raw_bytes, generation, clients, LOCK, socketio):
+    """Background job: emit the corrected final transcript for a stopped session."""
+    # Skip queued jobs that went stale before they got a worker
+    if not is_current_session(sid, generation, clients, LOCK):
+        logging.info(f"Skipping stale final pass for {sid}")
+        return
+
+    started = time.time()
+    try:
+        text, words = final_transcribe_buffer(raw_bytes)
+    except Exception as e:
+        logging.exception(f"Final pass failed for {sid}: {e}")
+        text, words = "", []
+
+    # Drop the result if the client left or started/cleared a new session meanwhile
+    if not is_current_session(sid, generation, clients, LOCK):
+        logging.info(f"Discarding stale final transcript for {sid}")
+        return
+
+    logging.info(f"Final pass for {sid} took {time.time() - started:.2f}s")
+    # Always emit so the client can stop waiting; empty text means "keep the live text"
+    socketio.emit("transcript", {"final": text, "words": words}, room=sid)
+
 # backend\transcribe.py (updated section with reset flag handling)
 
 def transcribe_loop(sid, clients, LOCK, socketio):
@@ -123,6 +243,7 @@ def transcribe_loop(sid, clients, LOCK, socketio):
                 stop_flag = state.get("stopped", False)
                 paused_flag = state.get("paused", False)
                 reset_flag = state.get("reset_flag", False)
+                generation = state.get("generation", 0)
                 
                 # Get the full buffer
                 raw_buffer = state.get("raw_buffer", bytearray())
@@ -156,6 +277,7 @@ def transcribe_loop(sid, clients, LOCK, socketio):
 
             # 3. STOP CONDITION
             if stop_flag and current_len == 0:
+                socketio.emit("transcript", {"final": accumulated_text, "words": []}, room=sid)
                 break
                 
             if current_len == 0:
@@ -215,8 +337,25 @@ def transcribe_loop(sid, clients, LOCK, socketio):
                         pass
                 
                 with LOCK:
-                    if sid in clients:
+                    still_current = (
+                        sid in clients
+                        and not clients[sid].get("disconnected", False)
+                        and clients[sid].get("generation", 0) == generation
+                    )
+                    # Detach this session's buffer (the one read in step 1); leave
+                    # alone any new buffer a later start_stream installed
+                    if sid in clients and clients[sid].get("raw_buffer") is raw_buffer:
                         clients[sid]["raw_buffer"] = bytearray()
+
+                # raw_buffer is no longer shared, so it can be handed off without a copy
+                if still_current:
+                    if FINAL_PASS_ENABLED:
+                        get_final_pass_executor().submit(
+                            run_final_pass, sid, raw_buffer, generation,
+                            clients, LOCK, socketio
+                        )
+                    else:
+                        socketio.emit("transcript", {"final": accumulated_text, "words": []}, room=sid)
                 break
 
             # Dynamic sleep based on activity
@@ -370,7 +370,12 @@ function ensureSocketConnected() {
 
   socket.on("transcript", (data) => {
     if (win && win.webContents) {
-      win.webContents.send("mic-text", data.partial || "");
+      if (data.final !== undefined) {
+        // Terminal transcript for a stopped session, sent once
+        win.webContents.send("mic-final", data.final || "");
+      } else {
+        win.webContents.send("mic-text", data.partial || "");
+      }
     }
   });
 
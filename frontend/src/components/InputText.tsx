@@ -45,6 +45,9 @@ interface ScreenAnalysis {
   _raw?: string;
 }
 
+// How long to wait for the backend's final transcript before sending the live text
+const FINAL_TRANSCRIPT_TIMEOUT_MS = 10000;
+
 export default function InputText({
   input,
   setInput,
@@ -64,6 +67,10 @@ export default function InputText({
   const [isAnalyzingScreen, setIsAnalyzingScreen] = useState(false);
  
   const committedRef = useRef<string>("");
+  const wasRecordingRef = useRef(false);
+  const awaitingFinalRef = useRef(false);
+  const finalTimeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+  const finishVoiceInputRef = useRef<(finalText?: string) => void>(() => {});
   
   useEffect(() => {
   if (typeof window === "undefined") return;
@@ -82,6 +89,11 @@ export default function InputText({
     committedRef.current = text;
   };
 
+  const handleFinal = (text: string) => {
+    if (!isMounted) return;
+    finishVoiceInputRef.current(typeof text === "string" ? text : "");
+  };
+
   const handleError = (message: string) => {
     if (!isMounted) return;
     setError(message);
@@ -89,28 +101,31 @@ export default function InputText({
   };
 
   audioAPI.onText(handleText);
+  if (audioAPI.onFinal) audioAPI.onFinal(handleFinal);
   audioAPI.onError(handleError);
 
   return () => {
     isMounted = false;
+    if (finalTimeoutRef.current) clearTimeout(finalTimeoutRef.current);
   };
 }, [setInput]);
 
   
   useEffect(() => {
-    if (!isRecording && input.trim() && mode !== "keyboard") {
-      let currentInput = input.trim();
-      
-      if (screenReaderEnabled) {
-        handleSendWithScreenAnalysis(currentInput);
-      } else {
-        send(currentInput);
-      }
-      
-      setInput("");
-      committedRef.current = "";
-      currentInput = "";
+    const wasRecording = wasRecordingRef.current;
+    wasRecordingRef.current = isRecording;
+    if (isRecording || !wasRecording || mode === "keyboard") return;
+
+    awaitingFinalRef.current = true;
+
+    if (!window.audioAPI?.onFinal) {
+      // Preload without mic-final support: send the live text right away
+      finishVoiceInputRef.current();
+      return;
     }
+
+    // Wait for the final transcript, falling back to the live text on timeout
+    finalTimeoutRef.current = setTimeout(() => finishVoiceInputRef.current(), FINAL_TRANSCRIPT_TIMEOUT_MS);
   }, [isRecording]);
 
 
@@ -162,6 +177,8 @@ export default function InputText({
     }
 
     if (!isRecording) {
+      // Don't let a pending final transcript land in the new recording
+      finishVoiceInputRef.current();
       audioAPI.start(mode);
       setIsRecording(true);
       setIsPaused(false);
@@ -202,7 +219,16 @@ export default function InputText({
   };
 
 
+  const cancelPendingFinal = () => {
+    awaitingFinalRef.current = false;
+    if (finalTimeoutRef.current) {
+      clearTimeout(finalTimeoutRef.current);
+      finalTimeoutRef.current = null;
+    }
+  };
+
   const handleDeleteAudio = () => {
+    cancelPendingFinal();
     setInput("");
     committedRef.current = "";
   };
@@ -323,6 +349,25 @@ export default function InputText({
     }
   };
 
+  // Send a stopped recording once, preferring the final transcript over the live text
+  const finishVoiceInput = (finalText?: string) => {
+    if (!awaitingFinalRef.current) return;
+    cancelPendingFinal();
+
+    const currentInput = (finalText || input).trim();
+    if (!currentInput) return;
+
+    if (screenReaderEnabled) {
+      handleSendWithScreenAnalysis(currentInput);
+    } else {
+      send(currentInput);
+    }
+
+    setInput("");
+    committedRef.current = "";
+  };
+  finishVoiceInputRef.current = finishVoiceInput;
+
   const getModeIcon = () => {
     if (mode === "keyboard") return <IconPlus size={14} />;
     if (mode === "voice") return <Mic size={14} />;
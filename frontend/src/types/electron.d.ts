@@ -22,6 +22,7 @@ declare global {
       resume?: () => void;
       delete?: () => void;
       onText: (callback: (text: string) => void) => void;
+      onFinal?: (callback: (text: string) => void) => void;
       onError: (callback: (message: string) => void) => void; 
     };
     screenAPI?: {